@@ -5,10 +5,13 @@ import os
 class Settings(BaseModel):
     app_name: str = "CS2 Skin AI Intelligence"
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./data/skins.db")
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "30"))
     tracker_seed_days: int = int(os.getenv("TRACKER_SEED_DAYS", "30"))
     provider_name: str = os.getenv("PROVIDER_NAME", "steam")
     track_interval_hours: int = int(os.getenv("TRACK_INTERVAL_HOURS", "24"))
     steam_currency: int = int(os.getenv("STEAM_CURRENCY", "1"))
+    templates_auto_reload: bool = os.getenv("TEMPLATES_AUTO_RELOAD", "0") == "1"
 
 
 settings = Settings()
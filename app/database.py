@@ -1,9 +1,10 @@
 from pathlib import Path
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import Column, MetaData, String, Table, create_engine, event, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.config import settings
+from app.providers.catalog import TRACKED_NAMES
 
 
 def _prepare_sqlite_dir(database_url: str) -> None:
@@ -17,16 +18,64 @@ def _prepare_sqlite_dir(database_url: str) -> None:
 
 _prepare_sqlite_dir(settings.database_url)
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
+if settings.database_url.startswith("sqlite"):
+    engine = create_engine(
+        settings.database_url,
+        pool_size=min(settings.db_pool_size, 10),
+        max_overflow=min(settings.db_max_overflow, 20),
+        pool_recycle=3600,
+        pool_pre_ping=True,
+        connect_args={"check_same_thread": False},
+    )
+else:
+    engine = create_engine(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=3600,
+        pool_pre_ping=True,
+    )
+
+# Session-local lookup table joined against instead of binding the full
+# tracked-name list as an IN (...) parameter set on every query. Populated
+# per pooled connection by the connect listener below.
+tracked_names_table = Table(
+    "tracked_names",
+    MetaData(),
+    Column("name", String(255), primary_key=True),
 )
+tracked_temp_enabled = settings.database_url.startswith("sqlite")
+
+_TRACKED_NAME_ROWS = [(name,) for name in TRACKED_NAMES]
+
+if settings.database_url.startswith("sqlite"):
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _connection_record) -> None:
+        # WAL + NORMAL sync cuts fsyncs on the snapshot write path and lets
+        # readers proceed while the tracker is writing.
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS tracked_names(name TEXT PRIMARY KEY)")
+        cursor.executemany("INSERT OR IGNORE INTO tracked_names(name) VALUES (?)", _TRACKED_NAME_ROWS)
+        cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+_schema_checked = False
+
+
 def ensure_schema_columns() -> None:
-    if not settings.database_url.startswith("sqlite"):
+    global _schema_checked
+    if _schema_checked or not settings.database_url.startswith("sqlite"):
         return
 
     migrations = {
@@ -41,6 +90,13 @@ def ensure_schema_columns() -> None:
         },
     }
 
+    index_migrations = [
+        "CREATE INDEX IF NOT EXISTS ix_snap_date_id_desc ON price_snapshots (snapshot_date, id)",
+        # Redundant with the uq_skin_date unique index, whose skin_id prefix
+        # serves equality lookups and (with a backward scan) date ordering.
+        "DROP INDEX IF EXISTS ix_price_snapshots_skin_id",
+    ]
+
     with engine.begin() as conn:
         for table, table_migrations in migrations.items():
             existing = {
@@ -50,9 +106,16 @@ def ensure_schema_columns() -> None:
             for col, ddl in table_migrations.items():
                 if col not in existing:
                     conn.execute(text(ddl))
+        for ddl in index_migrations:
+            conn.execute(text(ddl))
+
+    _schema_checked = True
 
 
 def get_db():
+    # FastAPI runs a sync dependency's setup and teardown on separate
+    # threadpool workers, so thread-local session scoping breaks under
+    # concurrency; yield a plain session and close that exact object.
     db = SessionLocal()
     try:
         yield db
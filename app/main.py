@@ -1,55 +1,115 @@
-from datetime import date
+import asyncio
+from datetime import date, datetime, timezone
 from pathlib import Path
 import shutil
 import subprocess
-import urllib.parse
+import threading
+import time
 from typing import Union
 
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import Depends, FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.requests import Request
+from jinja2 import Environment, FileSystemLoader
 from sqlalchemy import delete, func, select
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import Base, SessionLocal, engine, ensure_schema_columns, get_db
+from app.database import (
+    Base,
+    SessionLocal,
+    engine,
+    ensure_schema_columns,
+    get_db,
+    tracked_names_table,
+    tracked_temp_enabled,
+)
 from app.models import PriceSnapshot, Skin
-from app.providers.catalog import CS2_SKIN_CATALOG
-from app.schemas import PortfolioSimRead, PriceSnapshotRead, RecommendationRead, SkinRead
+from app.providers.catalog import CATALOG_BY_NAME, LISTING_URLS, TRACKED_NAMES
+from app.schemas import (
+    AuditSnapshotRead,
+    PortfolioSimRead,
+    PriceSnapshotRead,
+    RecommendationRead,
+    SkinRead,
+)
 from app.services.provider_factory import build_provider
 from app.services.recommendation import build_recommendations
 from app.services.simulation import simulate_ai_portfolio
 from app.services.tracker import (
     backfill_history,
     backfill_seed_data,
+    data_version,
     ensure_tracked_universe,
     ingest_ticks,
     track_prices_for_date,
 )
 
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, default_response_class=ORJSONResponse)
 
 base_dir = Path(__file__).resolve().parent.parent
 app.mount("/web", StaticFiles(directory=str(base_dir / "web")), name="web")
-templates = Jinja2Templates(directory=str(base_dir / "web"))
+# auto_reload stats the template on every render; keep it off outside dev
+# (TEMPLATES_AUTO_RELOAD=1) and let compiled templates stay cached.
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(str(base_dir / "web")),
+        autoescape=True,
+        auto_reload=settings.templates_auto_reload,
+        cache_size=400,
+    )
+)
+
+# Rides the running uvicorn event loop instead of spawning its own thread;
+# sync jobs still execute in the scheduler's default executor.
+scheduler = AsyncIOScheduler(timezone="UTC")
+
+
+def _only_tracked(stmt):
+    """Restrict a Skin select to the tracked universe.
+
+    On SQLite this joins the per-connection tracked_names TEMP table (zero
+    bind parameters); elsewhere it falls back to a name IN (...) filter.
+    """
+    if tracked_temp_enabled:
+        return stmt.join(tracked_names_table, Skin.name == tracked_names_table.c.name)
+    return stmt.where(Skin.name.in_(TRACKED_NAMES))
+
+
+_tracked_skin_ids: tuple[int, ...] = ()
+
 
-scheduler = BackgroundScheduler(timezone="UTC")
+def _get_tracked_skin_ids(db: Session) -> tuple[int, ...]:
+    # Integer IN lists bind and plan cheaper than long text IN lists; the id
+    # set only changes when ensure_tracked_universe creates missing skins, so
+    # re-resolve only while coverage is incomplete.
+    global _tracked_skin_ids
+    if len(_tracked_skin_ids) < len(TRACKED_NAMES):
+        _tracked_skin_ids = tuple(db.scalars(_only_tracked(select(Skin.id))).all())
+    return _tracked_skin_ids
 
 
-def _listing_url(name: str) -> str:
-    return f"https://steamcommunity.com/market/listings/730/{urllib.parse.quote(name, safe='')}"
+_seed_bootstrap_done = False
 
 
 def _bootstrap_seed_database_if_missing() -> None:
+    # Runs on every startup (including dev reloads); once the target exists
+    # the stat probes below are pure overhead, so short-circuit after the
+    # first successful pass in this process.
+    global _seed_bootstrap_done
+    if _seed_bootstrap_done:
+        return
     if not settings.database_url.startswith("sqlite:///"):
+        _seed_bootstrap_done = True
         return
 
     raw_path = settings.database_url.replace("sqlite:///", "", 1)
     db_path = Path(raw_path) if raw_path.startswith("/") else (base_dir / raw_path)
     if db_path.exists():
+        _seed_bootstrap_done = True
         return
 
     seed_candidates = [base_dir / "seed" / "skins.db", base_dir / "data" / "skins.db"]
@@ -59,53 +119,107 @@ def _bootstrap_seed_database_if_missing() -> None:
 
     db_path.parent.mkdir(parents=True, exist_ok=True)
     shutil.copy2(seed_path, db_path)
+    _seed_bootstrap_done = True
 
 
-@app.on_event("startup")
-def startup() -> None:
-    _bootstrap_seed_database_if_missing()
-    Base.metadata.create_all(bind=engine)
-    ensure_schema_columns()
+def _warmup() -> None:
+    """Seed the tracked universe and history outside the startup critical path."""
     db = SessionLocal()
     try:
         ensure_tracked_universe(db, enrich_images=False)
         backfill_seed_data(db, settings.tracker_seed_days)
+        _get_tracked_skin_ids(db)
     finally:
         db.close()
+    app.state.ready = True
+
+
+@app.on_event("startup")
+def startup() -> None:
+    global scheduler
+
+    _bootstrap_seed_database_if_missing()
+    Base.metadata.create_all(bind=engine)
+    ensure_schema_columns()
 
+    # Universe/backfill seeding can take seconds to minutes; run it in the
+    # background so the worker answers probes immediately. /ready reports 503
+    # until the warm-up finishes.
+    app.state.ready = False
+    threading.Thread(target=_warmup, name="warmup", daemon=True).start()
+
+    # Rebuild per lifespan: an AsyncIOScheduler stays bound to the event loop
+    # it was started on, which breaks app restarts within one process.
+    scheduler = AsyncIOScheduler(timezone="UTC")
     scheduler.add_job(_daily_track_job, "interval", hours=settings.track_interval_hours, id="daily-tracker", replace_existing=True)
     scheduler.start()
 
+    app.state.k8s_client = _build_k8s_client()
+
 
 @app.on_event("shutdown")
-def shutdown() -> None:
+async def shutdown() -> None:
     if scheduler.running:
         scheduler.shutdown(wait=False)
+    k8s_client = getattr(app.state, "k8s_client", None)
+    if k8s_client is not None:
+        await k8s_client.aclose()
+    build_provider().close()
 
 
-def _daily_track_job() -> None:
-    db = SessionLocal()
-    try:
-        track_prices_for_date(db, date.today())
-    finally:
-        db.close()
+async def _daily_track_job() -> None:
+    # Runs on the event loop; push the blocking DB/provider work to a worker
+    # thread so request handling is never stalled by an ingest.
+    def _run() -> None:
+        db = SessionLocal()
+        try:
+            track_prices_for_date(db, date.today())
+        finally:
+            db.close()
+
+    await asyncio.to_thread(_run)
+
+
+# Rendered once; the probe endpoints are hit continuously by liveness checks
+# and should not pay validation/encoding per request.
+_HEALTH_RESPONSE = ORJSONResponse({"status": "ok"}, headers={"Cache-Control": "no-store"})
+
+
+_WARMING_RESPONSE = ORJSONResponse(
+    {"status": "warming"}, status_code=503, headers={"Cache-Control": "no-store"}
+)
 
 
 @app.get("/health")
-def health() -> dict[str, str]:
-    return {"status": "ok"}
+def health() -> ORJSONResponse:
+    return _HEALTH_RESPONSE
+
+
+@app.get("/ready")
+def ready() -> ORJSONResponse:
+    return _HEALTH_RESPONSE if getattr(app.state, "ready", False) else _WARMING_RESPONSE
 
 
 @app.get("/", response_class=HTMLResponse)
 def dashboard(request: Request, db: Session = Depends(get_db)) -> HTMLResponse:
-    catalog_by_name = {item["name"]: item for item in CS2_SKIN_CATALOG}
-    tracked_names = list(catalog_by_name.keys())
     recs = build_recommendations(db, limit=5)
-    db_skins = db.scalars(select(Skin).where(Skin.name.in_(tracked_names))).all()
-    db_skin_map = {skin.name: skin for skin in db_skins}
+    # One round-trip: skin columns plus per-skin snapshot counts via an
+    # aggregated LEFT JOIN; the page total is the sum of the counts.
+    db_skin_rows = db.execute(
+        _only_tracked(
+            select(
+                Skin.id,
+                Skin.name,
+                Skin.image_url,
+                Skin.listing_url,
+                func.count(PriceSnapshot.id).label("snapshot_count"),
+            ).outerjoin(PriceSnapshot, PriceSnapshot.skin_id == Skin.id)
+        ).group_by(Skin.id)
+    ).all()
+    db_skin_map = {row.name: row for row in db_skin_rows}
     tracked = []
-    for name in tracked_names:
-        item = catalog_by_name[name]
+    for name in TRACKED_NAMES:
+        item = CATALOG_BY_NAME[name]
         skin = db_skin_map.get(name)
         tracked.append(
             {
@@ -114,12 +228,12 @@ def dashboard(request: Request, db: Session = Depends(get_db)) -> HTMLResponse:
                 "rarity": item["rarity"],
                 "category": item["category"],
                 "image_url": skin.image_url if skin else None,
-                "listing_url": skin.listing_url if skin and skin.listing_url else _listing_url(name),
+                "listing_url": skin.listing_url if skin and skin.listing_url else LISTING_URLS[name],
                 "thesis": item.get("thesis"),
             }
         )
-    total_skins = len(tracked_names)
-    total_snapshots = len(db.scalars(select(PriceSnapshot)).all())
+    total_skins = len(TRACKED_NAMES)
+    total_snapshots = sum(row.snapshot_count for row in db_skin_rows)
     return templates.TemplateResponse(
         "index.html",
         {
@@ -157,12 +271,17 @@ def rebuild_real_dataset(days: int = 180, db: Session = Depends(get_db)) -> dict
     if not history_ticks:
         return {"deleted_snapshots": 0, "historical_created": 0, "latest_created": 0}
 
-    tracked_names = [item["name"] for item in CS2_SKIN_CATALOG]
-    tracked_ids = db.scalars(select(Skin.id).where(Skin.name.in_(tracked_names))).all()
-    deleted = 0
-    if tracked_ids:
-        deleted = db.execute(delete(PriceSnapshot).where(PriceSnapshot.skin_id.in_(tracked_ids))).rowcount or 0
-        db.commit()
+    # Delete through a subquery so the database resolves tracked skin ids
+    # itself instead of round-tripping the id list through Python.
+    deleted = (
+        db.execute(
+            delete(PriceSnapshot).where(
+                PriceSnapshot.skin_id.in_(select(Skin.id).where(Skin.name.in_(TRACKED_NAMES)))
+            )
+        ).rowcount
+        or 0
+    )
+    db.commit()
 
     historical_created = ingest_ticks(db, history_ticks)
     latest_created = track_prices_for_date(db, date.today())
@@ -181,8 +300,7 @@ def enrich_images(db: Session = Depends(get_db)) -> dict[str, int]:
 
 @app.get("/skins", response_model=list[SkinRead])
 def list_skins(db: Session = Depends(get_db)) -> list[SkinRead]:
-    tracked_names = [item["name"] for item in CS2_SKIN_CATALOG]
-    return db.scalars(select(Skin).where(Skin.name.in_(tracked_names)).order_by(Skin.name)).all()
+    return db.scalars(_only_tracked(select(Skin)).order_by(Skin.name)).all()
 
 
 @app.get("/history/{skin_id}", response_model=list[PriceSnapshotRead])
@@ -210,16 +328,26 @@ def ai_portfolio_simulation(
     result = simulate_ai_portfolio(db, initial_capital=max(1000.0, min(initial_capital, 250000.0)), top_n=top_n)
     if result is None:
         raise HTTPException(status_code=404, detail="Not enough historical data to run simulation")
-    payload = vars(result).copy()
-    payload["points"] = [vars(p) for p in result.points]
-    return PortfolioSimRead(**payload)
+    return PortfolioSimRead.model_validate(result)
+
+
+_audit_summary_cache: tuple[int, dict[str, object]] | None = None
+_audit_summary_lock = threading.Lock()
 
 
 @app.get("/audit/summary")
 def audit_summary(db: Session = Depends(get_db)) -> dict[str, object]:
-    tracked_names = [item["name"] for item in CS2_SKIN_CATALOG]
+    # Six aggregate scans are only worth paying when an ingest has actually
+    # changed the snapshot table since the last request.
+    global _audit_summary_cache
+    version = data_version()
+    with _audit_summary_lock:
+        cached = _audit_summary_cache
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
     total_snapshots = int(db.scalar(select(func.count()).select_from(PriceSnapshot)) or 0)
-    covered_skins = int(db.scalar(select(func.count()).select_from(Skin).where(Skin.name.in_(tracked_names))) or 0)
+    covered_skins = int(db.scalar(_only_tracked(select(func.count()).select_from(Skin))) or 0)
     distinct_dates = int(db.scalar(select(func.count(func.distinct(PriceSnapshot.snapshot_date)))) or 0)
     first_date = db.scalar(select(func.min(PriceSnapshot.snapshot_date)))
     last_date = db.scalar(select(func.max(PriceSnapshot.snapshot_date)))
@@ -232,10 +360,10 @@ def audit_summary(db: Session = Depends(get_db)) -> dict[str, object]:
     )
     verified_count = max(0, total_snapshots - unknown_count)
 
-    return {
-        "tracked_skins": len(tracked_names),
+    payload: dict[str, object] = {
+        "tracked_skins": len(TRACKED_NAMES),
         "covered_skins": covered_skins,
-        "tracked_universe_target": len(tracked_names),
+        "tracked_universe_target": len(TRACKED_NAMES),
         "total_snapshots": total_snapshots,
         "distinct_days": distinct_dates,
         "first_snapshot_date": str(first_date) if first_date else None,
@@ -244,67 +372,88 @@ def audit_summary(db: Session = Depends(get_db)) -> dict[str, object]:
         "unverified_snapshots": unknown_count,
         "source_breakdown": [{"source": source, "count": int(count)} for source, count in sources],
     }
+    with _audit_summary_lock:
+        _audit_summary_cache = (version, payload)
+    return payload
 
 
-@app.get("/audit/snapshots")
-def audit_snapshots(limit: int = 50, db: Session = Depends(get_db)) -> list[dict[str, object]]:
-    tracked_names = [item["name"] for item in CS2_SKIN_CATALOG]
-    rows = db.execute(
+@app.get("/audit/snapshots", response_model=list[AuditSnapshotRead])
+def audit_snapshots(limit: int = 50, db: Session = Depends(get_db)):
+    # Labeled columns line up with AuditSnapshotRead, so the row mappings go
+    # straight to the response model without a hand-built dict per row.
+    return db.execute(
         select(
-            PriceSnapshot.id,
+            PriceSnapshot.id.label("snapshot_id"),
             PriceSnapshot.snapshot_date,
             PriceSnapshot.price_usd,
             PriceSnapshot.volume_24h,
             PriceSnapshot.source,
             PriceSnapshot.source_ref,
-            Skin.name,
+            Skin.name.label("skin_name"),
         )
         .join(Skin, Skin.id == PriceSnapshot.skin_id)
-        .where(Skin.name.in_(tracked_names))
+        .where(PriceSnapshot.skin_id.in_(_get_tracked_skin_ids(db)))
         .order_by(PriceSnapshot.snapshot_date.desc(), PriceSnapshot.id.desc())
         .limit(max(1, min(limit, 200)))
-    ).all()
-    return [
-        {
-            "snapshot_id": int(row[0]),
-            "snapshot_date": str(row[1]),
-            "price_usd": float(row[2]),
-            "volume_24h": int(row[3]),
-            "source": row[4],
-            "source_ref": row[5],
-            "skin_name": row[6],
-        }
-        for row in rows
-    ]
+    ).mappings().all()
+
+
+_tracked_universe_cache: tuple[tuple[int, int | None], dict[str, object]] | None = None
+_tracked_universe_lock = threading.Lock()
+
+
+def _tracked_universe_skins(skin_map: dict[str, object]) -> list[dict[str, object]]:
+    # One .get() per name instead of repeated membership tests and subscripts.
+    skins: list[dict[str, object]] = []
+    for name in TRACKED_NAMES:
+        skin = skin_map.get(name)
+        item = CATALOG_BY_NAME[name]
+        skins.append(
+            {
+                "id": skin.id if skin else None,
+                "name": name,
+                "category": item["category"],
+                "rarity": item["rarity"],
+                "thesis": item.get("thesis"),
+                "image_url": skin.image_url if skin else None,
+                "listing_url": skin.listing_url if skin and skin.listing_url else LISTING_URLS[name],
+            }
+        )
+    return skins
 
 
 @app.get("/audit/tracked-universe")
 def audit_tracked_universe(db: Session = Depends(get_db)) -> dict[str, object]:
-    catalog_by_name = {item["name"]: item for item in CS2_SKIN_CATALOG}
-    tracked_names = list(catalog_by_name.keys())
-    skins = db.scalars(select(Skin).where(Skin.name.in_(tracked_names))).all()
-    skin_map = {skin.name: skin for skin in skins}
-    return {
-        "count": len(tracked_names),
-        "covered_skins": len(skins),
-        "target": len(tracked_names),
+    # Skin rows only change at ingest time; a (count, max id) signature is
+    # enough to detect that and skip rebuilding the payload.
+    global _tracked_universe_cache
+    sig = tuple(
+        db.execute(
+            _only_tracked(select(func.count(Skin.id), func.max(Skin.id)))
+        ).one()
+    )
+    with _tracked_universe_lock:
+        cached = _tracked_universe_cache
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
+    skin_rows = db.execute(
+        _only_tracked(select(Skin.id, Skin.name, Skin.image_url, Skin.listing_url))
+    ).all()
+    skin_map = {row.name: row for row in skin_rows}
+    payload: dict[str, object] = {
+        "count": len(TRACKED_NAMES),
+        "covered_skins": len(skin_rows),
+        "target": len(TRACKED_NAMES),
         "selection_criteria": (
             "Universe is a curated basket favoring high liquidity, recognizable skins, "
             "cross-weapon coverage, and investable volatility."
         ),
-        "skins": [
-            {
-                "id": skin_map[name].id if name in skin_map else None,
-                "name": name,
-                "category": catalog_by_name[name]["category"],
-                "rarity": catalog_by_name[name]["rarity"],
-                "thesis": catalog_by_name[name].get("thesis"),
-                "image_url": skin_map[name].image_url if name in skin_map else None,
-                "listing_url": skin_map[name].listing_url if name in skin_map and skin_map[name].listing_url else _listing_url(name),
-            }
-            for name in tracked_names
-        ],
+        "skins": _tracked_universe_skins(skin_map),
     }
+    with _tracked_universe_lock:
+        _tracked_universe_cache = (sig, payload)
+    return payload
 
 
 # ── K8s Monitoring ─────────────────────────────────────────
@@ -312,6 +461,9 @@ def audit_tracked_universe(db: Session = Depends(get_db)) -> dict[str, object]:
 import json
 import os
 import ssl
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 
 _K8S_HOST = os.environ.get("KUBERNETES_SERVICE_HOST", "")
 _K8S_PORT = os.environ.get("KUBERNETES_SERVICE_PORT", "443")
@@ -319,18 +471,26 @@ _K8S_TOKEN_PATH = "/var/run/secrets/kubernetes.io/serviceaccount/token"
 _K8S_CA_PATH = "/var/run/secrets/kubernetes.io/serviceaccount/ca.crt"
 
 
-def _k8s_api_get(path: str) -> dict | list | None:
-    """Call Kubernetes API from inside a pod using the mounted service account."""
+def _build_k8s_client() -> httpx.AsyncClient | None:
+    """Build a reusable async client for the in-cluster Kubernetes API."""
+    if not _K8S_HOST:
+        return None
     try:
-        import httpx as _httpx
         token = Path(_K8S_TOKEN_PATH).read_text().strip()
-        base = f"https://{_K8S_HOST}:{_K8S_PORT}"
-        resp = _httpx.get(
-            f"{base}{path}",
+        return httpx.AsyncClient(
+            base_url=f"https://{_K8S_HOST}:{_K8S_PORT}",
             headers={"Authorization": f"Bearer {token}"},
             verify=_K8S_CA_PATH,
             timeout=5,
         )
+    except Exception:
+        return None
+
+
+async def _k8s_api_get(client: httpx.AsyncClient, path: str) -> dict | list | None:
+    """Call Kubernetes API from inside a pod using the mounted service account."""
+    try:
+        resp = await client.get(path)
         if resp.status_code == 200:
             return resp.json()
     except Exception:
@@ -349,12 +509,13 @@ def _run_kubectl(args: list[str], timeout: int = 5) -> str:
         return ""
 
 
-def _age_str(ts: str) -> str:
-    """Convert ISO timestamp to a human-readable age string."""
-    from datetime import datetime, timezone
+def _age_str(ts: str, now: datetime) -> str:
+    """Convert ISO timestamp to a human-readable age string relative to `now`."""
+    if not ts:
+        return ts
     try:
-        created = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-        delta = datetime.now(timezone.utc) - created
+        created = datetime.fromisoformat(ts[:-1] + "+00:00" if ts.endswith("Z") else ts)
+        delta = now - created
         secs = int(delta.total_seconds())
         if secs < 60:
             return f"{secs}s"
@@ -367,20 +528,23 @@ def _age_str(ts: str) -> str:
         return ts
 
 
-def _k8s_info_from_api() -> dict[str, object] | None:
+async def _k8s_info_from_api(client: httpx.AsyncClient | None) -> dict[str, object] | None:
     """Fetch cluster info via the Kubernetes REST API (in-cluster)."""
-    if not _K8S_HOST:
+    if client is None:
         return None
 
-    pods_data = _k8s_api_get("/api/v1/pods")
-    svc_data = _k8s_api_get("/api/v1/services")
-    deploy_data = _k8s_api_get("/apis/apps/v1/deployments")
-    node_data = _k8s_api_get("/api/v1/nodes")
-    ns_data = _k8s_api_get("/api/v1/namespaces")
+    pods_data, svc_data, deploy_data, node_data, ns_data = await asyncio.gather(
+        _k8s_api_get(client, "/api/v1/pods"),
+        _k8s_api_get(client, "/api/v1/services"),
+        _k8s_api_get(client, "/apis/apps/v1/deployments"),
+        _k8s_api_get(client, "/api/v1/nodes"),
+        _k8s_api_get(client, "/api/v1/namespaces"),
+    )
 
     if pods_data is None:
         return None
 
+    now = datetime.now(timezone.utc)
     pods = []
     for item in (pods_data.get("items") or []):
         meta = item.get("metadata", {})
@@ -395,7 +559,7 @@ def _k8s_info_from_api() -> dict[str, object] | None:
             "ready": ready_val,
             "restarts": str(cs.get("restartCount", 0)),
             "node": item.get("spec", {}).get("nodeName", ""),
-            "age": _age_str(meta.get("creationTimestamp", "")),
+            "age": _age_str(meta.get("creationTimestamp", ""), now),
         })
 
     svcs = []
@@ -409,7 +573,7 @@ def _k8s_info_from_api() -> dict[str, object] | None:
             "type": spec.get("type", ""),
             "cluster_ip": spec.get("clusterIP", ""),
             "ports": ports,
-            "age": _age_str(meta.get("creationTimestamp", "")),
+            "age": _age_str(meta.get("creationTimestamp", ""), now),
         })
 
     deploys = []
@@ -426,7 +590,7 @@ def _k8s_info_from_api() -> dict[str, object] | None:
             "up_to_date": str(st.get("updatedReplicas", 0) or 0),
             "available": str(st.get("availableReplicas", 0) or 0),
             "desired": str(desired),
-            "age": _age_str(meta.get("creationTimestamp", "")),
+            "age": _age_str(meta.get("creationTimestamp", ""), now),
         })
 
     nodes = []
@@ -445,7 +609,7 @@ def _k8s_info_from_api() -> dict[str, object] | None:
             "version": ni.get("kubeletVersion", ""),
             "os": ni.get("osImage", ""),
             "arch": ni.get("architecture", ""),
-            "age": _age_str(meta.get("creationTimestamp", "")),
+            "age": _age_str(meta.get("creationTimestamp", ""), now),
         })
 
     nses = []
@@ -454,46 +618,67 @@ def _k8s_info_from_api() -> dict[str, object] | None:
         nses.append({
             "name": meta.get("name", ""),
             "status": item.get("status", {}).get("phase", ""),
-            "age": _age_str(meta.get("creationTimestamp", "")),
+            "age": _age_str(meta.get("creationTimestamp", ""), now),
         })
 
     return {"pods": pods, "services": svcs, "deployments": deploys, "nodes": nodes, "namespaces": nses}
 
 
+_KUBECTL_QUERIES = {
+    "pods": ["get", "pods", "--all-namespaces", "--no-headers",
+             "-o", "custom-columns=NAME:.metadata.name,NAMESPACE:.metadata.namespace,"
+             "STATUS:.status.phase,READY:.status.conditions[?(@.type=='Ready')].status,"
+             "RESTARTS:.status.containerStatuses[0].restartCount,"
+             "NODE:.spec.nodeName,AGE:.metadata.creationTimestamp"],
+    "services": ["get", "svc", "--all-namespaces", "--no-headers",
+                 "-o", "custom-columns=NAME:.metadata.name,NAMESPACE:.metadata.namespace,"
+                 "TYPE:.spec.type,CLUSTER-IP:.spec.clusterIP,"
+                 "PORTS:.spec.ports[*].port,AGE:.metadata.creationTimestamp"],
+    "deployments": ["get", "deployments", "--all-namespaces", "--no-headers",
+                    "-o", "custom-columns=NAME:.metadata.name,NAMESPACE:.metadata.namespace,"
+                    "READY:.status.readyReplicas,UP-TO-DATE:.status.updatedReplicas,"
+                    "AVAILABLE:.status.availableReplicas,DESIRED:.spec.replicas,"
+                    "AGE:.metadata.creationTimestamp"],
+    "nodes": ["get", "nodes", "--no-headers",
+              "-o", "custom-columns=NAME:.metadata.name,"
+              "STATUS:.status.conditions[?(@.type=='Ready')].status,"
+              "ROLES:.metadata.labels.node-role\\.kubernetes\\.io/control-plane,"
+              "VERSION:.status.nodeInfo.kubeletVersion,"
+              "OS:.status.nodeInfo.osImage,ARCH:.status.nodeInfo.architecture,"
+              "AGE:.metadata.creationTimestamp"],
+    "namespaces": ["get", "namespaces", "--no-headers",
+                   "-o", "custom-columns=NAME:.metadata.name,"
+                   "STATUS:.status.phase,AGE:.metadata.creationTimestamp"],
+}
+
+
 def _k8s_info_from_kubectl() -> dict[str, object]:
-    """Fallback: fetch cluster info via kubectl CLI."""
-    pods_raw = _run_kubectl(["get", "pods", "--all-namespaces", "--no-headers",
-                             "-o", "custom-columns=NAME:.metadata.name,NAMESPACE:.metadata.namespace,"
-                             "STATUS:.status.phase,READY:.status.conditions[?(@.type=='Ready')].status,"
-                             "RESTARTS:.status.containerStatuses[0].restartCount,"
-                             "NODE:.spec.nodeName,AGE:.metadata.creationTimestamp"])
+    """Fallback: fetch cluster info via kubectl CLI (five calls run concurrently)."""
+    with ThreadPoolExecutor(max_workers=len(_KUBECTL_QUERIES)) as executor:
+        raw = dict(zip(_KUBECTL_QUERIES, executor.map(_run_kubectl, _KUBECTL_QUERIES.values())))
+
+    now = datetime.now(timezone.utc)
+    pods_raw = raw["pods"]
     pods = []
     for line in (pods_raw or "").strip().splitlines():
         parts = line.split(None, 6)
         if len(parts) >= 7:
             pods.append({
                 "name": parts[0], "namespace": parts[1], "status": parts[2],
-                "ready": parts[3], "restarts": parts[4], "node": parts[5], "age": _age_str(parts[6]),
+                "ready": parts[3], "restarts": parts[4], "node": parts[5], "age": _age_str(parts[6], now),
             })
 
-    svc_raw = _run_kubectl(["get", "svc", "--all-namespaces", "--no-headers",
-                            "-o", "custom-columns=NAME:.metadata.name,NAMESPACE:.metadata.namespace,"
-                            "TYPE:.spec.type,CLUSTER-IP:.spec.clusterIP,"
-                            "PORTS:.spec.ports[*].port,AGE:.metadata.creationTimestamp"])
+    svc_raw = raw["services"]
     svcs = []
     for line in (svc_raw or "").strip().splitlines():
         parts = line.split(None, 5)
         if len(parts) >= 6:
             svcs.append({
                 "name": parts[0], "namespace": parts[1], "type": parts[2],
-                "cluster_ip": parts[3], "ports": parts[4], "age": _age_str(parts[5]),
+                "cluster_ip": parts[3], "ports": parts[4], "age": _age_str(parts[5], now),
             })
 
-    deploy_raw = _run_kubectl(["get", "deployments", "--all-namespaces", "--no-headers",
-                               "-o", "custom-columns=NAME:.metadata.name,NAMESPACE:.metadata.namespace,"
-                               "READY:.status.readyReplicas,UP-TO-DATE:.status.updatedReplicas,"
-                               "AVAILABLE:.status.availableReplicas,DESIRED:.spec.replicas,"
-                               "AGE:.metadata.creationTimestamp"])
+    deploy_raw = raw["deployments"]
     deploys = []
     for line in (deploy_raw or "").strip().splitlines():
         parts = line.split(None, 6)
@@ -506,16 +691,10 @@ def _k8s_info_from_kubectl() -> dict[str, object]:
                 "up_to_date": parts[3] if parts[3] != "<none>" else "0",
                 "available": parts[4] if parts[4] != "<none>" else "0",
                 "desired": desired_count,
-                "age": _age_str(parts[6]),
+                "age": _age_str(parts[6], now),
             })
 
-    node_raw = _run_kubectl(["get", "nodes", "--no-headers",
-                             "-o", "custom-columns=NAME:.metadata.name,"
-                             "STATUS:.status.conditions[?(@.type=='Ready')].status,"
-                             "ROLES:.metadata.labels.node-role\\.kubernetes\\.io/control-plane,"
-                             "VERSION:.status.nodeInfo.kubeletVersion,"
-                             "OS:.status.nodeInfo.osImage,ARCH:.status.nodeInfo.architecture,"
-                             "AGE:.metadata.creationTimestamp"])
+    node_raw = raw["nodes"]
     nodes = []
     for line in (node_raw or "").strip().splitlines():
         parts = line.split(None, 6)
@@ -524,25 +703,40 @@ def _k8s_info_from_kubectl() -> dict[str, object]:
             role_val = "control-plane" if parts[2] != "<none>" else "worker"
             nodes.append({
                 "name": parts[0], "status": status_val, "roles": role_val,
-                "version": parts[3], "os": parts[4], "arch": parts[5], "age": _age_str(parts[6]),
+                "version": parts[3], "os": parts[4], "arch": parts[5], "age": _age_str(parts[6], now),
             })
 
-    ns_raw = _run_kubectl(["get", "namespaces", "--no-headers",
-                           "-o", "custom-columns=NAME:.metadata.name,"
-                           "STATUS:.status.phase,AGE:.metadata.creationTimestamp"])
+    ns_raw = raw["namespaces"]
     nses = []
     for line in (ns_raw or "").strip().splitlines():
         parts = line.split(None, 2)
         if len(parts) >= 3:
-            nses.append({"name": parts[0], "status": parts[1], "age": _age_str(parts[2])})
+            nses.append({"name": parts[0], "status": parts[1], "age": _age_str(parts[2], now)})
 
     return {"pods": pods, "services": svcs, "deployments": deploys, "nodes": nodes, "namespaces": nses}
 
 
+_K8S_INFO_TTL_SECONDS = 10.0
+_k8s_info_cache: tuple[float, dict[str, object]] | None = None
+_k8s_info_cache_lock = threading.Lock()
+
+
 @app.get("/k8s/info")
-def k8s_info() -> dict[str, object]:
+async def k8s_info(force: int = 0) -> dict[str, object]:
+    # Cluster inventory changes slowly; serve a short-lived cached copy
+    # unless the caller explicitly bypasses it with ?force=1.
+    global _k8s_info_cache
+    if not force:
+        with _k8s_info_cache_lock:
+            cached = _k8s_info_cache
+        if cached is not None and (time.monotonic() - cached[0]) < _K8S_INFO_TTL_SECONDS:
+            return cached[1]
+
     # Try in-cluster API first, then kubectl fallback
-    result = _k8s_info_from_api()
-    if result is not None:
-        return result
-    return _k8s_info_from_kubectl()
+    result = await _k8s_info_from_api(getattr(app.state, "k8s_client", None))
+    if result is None:
+        result = await asyncio.to_thread(_k8s_info_from_kubectl)
+
+    with _k8s_info_cache_lock:
+        _k8s_info_cache = (time.monotonic(), result)
+    return result
@@ -1,7 +1,7 @@
 from datetime import date
 from typing import Optional
 
-from sqlalchemy import Date, Float, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import Date, Float, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -23,10 +23,18 @@ class Skin(Base):
 
 class PriceSnapshot(Base):
     __tablename__ = "price_snapshots"
-    __table_args__ = (UniqueConstraint("skin_id", "snapshot_date", name="uq_skin_date"),)
+    __table_args__ = (
+        # Doubles as the (skin_id, snapshot_date) composite index, so
+        # /history/{skin_id} reads snapshots in index order with no sort and
+        # skin_id needs no single-column index of its own.
+        UniqueConstraint("skin_id", "snapshot_date", name="uq_skin_date"),
+        # Matches the (snapshot_date DESC, id DESC) ordering of /audit/snapshots
+        # so the LIMIT can walk the index instead of sorting the joined result.
+        Index("ix_snap_date_id_desc", "snapshot_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    skin_id: Mapped[int] = mapped_column(ForeignKey("skins.id"), nullable=False, index=True)
+    skin_id: Mapped[int] = mapped_column(ForeignKey("skins.id"), nullable=False)
     snapshot_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     price_usd: Mapped[float] = mapped_column(Float, nullable=False)
     volume_24h: Mapped[int] = mapped_column(Integer, nullable=False)
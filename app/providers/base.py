@@ -27,5 +27,22 @@ class MarketDataProvider:
     def resolve_skin_image_url(self, skin_name: str) -> Optional[str]:
         return None
 
+    def resolve_icons_batch(self, skin_names: list[str]) -> dict[str, str]:
+        """Resolve image URLs for many skins; providers may override to batch."""
+        resolved: dict[str, str] = {}
+        for name in skin_names:
+            url = self.resolve_skin_image_url(name)
+            if url:
+                resolved[name] = url
+        return resolved
+
+    def prime_icon_cache(self, mapping: dict[str, str]) -> None:
+        """Seed any provider-side icon cache with already-known image URLs."""
+        return None
+
+    def close(self) -> None:
+        """Release any long-lived resources (HTTP connection pools)."""
+        return None
+
     def build_listing_url(self, skin_name: str) -> Optional[str]:
         return None
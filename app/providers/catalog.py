@@ -1,3 +1,6 @@
+import sys
+import urllib.parse
+
 CS2_SKIN_CATALOG = [
     {
         "name": "AK-47 | Redline (Field-Tested)",
@@ -150,3 +153,14 @@ CS2_SKIN_CATALOG = [
         "thesis": "Recognizable scout skin with medium liquidity and trendability.",
     },
 ]
+
+# Derived lookups built once at import; the catalog is a static module
+# constant, so request handlers should never rebuild these.
+CATALOG_BY_NAME = {item["name"]: item for item in CS2_SKIN_CATALOG}
+# Interned so repeated name comparisons during ingest resolve by pointer.
+TRACKED_NAMES: tuple[str, ...] = tuple(sys.intern(name) for name in CATALOG_BY_NAME)
+TRACKED_NAMES_SET = frozenset(TRACKED_NAMES)
+LISTING_URLS = {
+    name: f"https://steamcommunity.com/market/listings/730/{urllib.parse.quote(name, safe='')}"
+    for name in TRACKED_NAMES
+}
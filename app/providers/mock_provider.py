@@ -1,10 +1,48 @@
 from datetime import date, timedelta
-import hashlib
 import random
+import zlib
+
+import numpy as np
 
 from app.providers.base import MarketDataProvider, SkinMarketTick
 from app.providers.catalog import CS2_SKIN_CATALOG
 
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+_RARITY_BOOST = {"Contraband": 1.35, "Covert": 1.18, "Classified": 1.1}
+
+
+def _splitmix64(x: int) -> int:
+    # Non-cryptographic mix; seeding random.Random does not need SHA-256.
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _name_hash(name: str) -> int:
+    # crc32 rather than hash(): stable across processes, so the mock
+    # universe looks the same on every run.
+    return zlib.crc32(name.encode("utf-8"))
+
+
+# Per-skin values that do not depend on the snapshot date, computed once at
+# import instead of per tick.
+_SKIN_PARAMS = [
+    (
+        skin["name"],
+        skin["rarity"],
+        skin["category"],
+        _name_hash(skin["name"]),
+        30 + (_name_hash(skin["name"]) % 1500) / 10,
+        _RARITY_BOOST.get(skin["rarity"], 1.0),
+    )
+    for skin in CS2_SKIN_CATALOG
+]
+
+# Rarity-boosted base price per skin as one array for the vectorized backfill.
+_BOOSTED_BASE = np.array([base * boost for _, _, _, _, base, boost in _SKIN_PARAMS])
+
 
 class MockMarketDataProvider(MarketDataProvider):
     supports_historical = True
@@ -12,19 +50,11 @@ class MockMarketDataProvider(MarketDataProvider):
     def fetch_daily_ticks(self, for_date: date) -> list[SkinMarketTick]:
         ticks: list[SkinMarketTick] = []
         ordinal = for_date.toordinal()
-        for skin in CS2_SKIN_CATALOG:
-            name = skin["name"]
-            rarity = skin["rarity"]
-            category = skin["category"]
-            seed_material = f"{name}:{ordinal}".encode("utf-8")
-            seed = int(hashlib.sha256(seed_material).hexdigest(), 16) % (10**8)
-            rng = random.Random(seed)
-
-            base_price = 30 + (abs(hash(name)) % 1500) / 10
-            trend = (ordinal % 30 - 15) / 250
-            noise = rng.uniform(-0.05, 0.05)
-            rarity_boost = {"Contraband": 1.35, "Covert": 1.18, "Classified": 1.1}.get(rarity, 1.0)
+        trend = (ordinal % 30 - 15) / 250
+        for name, rarity, category, name_hash, base_price, rarity_boost in _SKIN_PARAMS:
+            rng = random.Random(_splitmix64(name_hash ^ ordinal))
 
+            noise = rng.uniform(-0.05, 0.05)
             price = round(max(1.5, base_price * rarity_boost * (1 + trend + noise)), 2)
             volume = int(max(20, rng.gauss(420, 140)))
             ticks.append(
@@ -40,9 +70,33 @@ class MockMarketDataProvider(MarketDataProvider):
         return ticks
 
     def fetch_history_ticks(self, days: int) -> list[SkinMarketTick]:
+        # Backfill draws the whole (skins x days) grid in a few NumPy calls
+        # instead of looping fetch_daily_ticks day by day.
         days = max(1, days)
         start = date.today() - timedelta(days=days - 1)
+        start_ordinal = start.toordinal()
+
+        ordinals = np.arange(start_ordinal, start_ordinal + days)
+        trend = ((ordinals % 30) - 15) / 250.0
+        rng = np.random.default_rng(_splitmix64(start_ordinal))
+        noise = rng.uniform(-0.05, 0.05, size=(len(_SKIN_PARAMS), days))
+        prices = np.maximum(1.5, _BOOSTED_BASE[:, None] * (1.0 + trend[None, :] + noise)).round(2)
+        volumes = np.maximum(20, rng.normal(420, 140, size=(len(_SKIN_PARAMS), days))).astype(np.int64)
+
+        dates = [start + timedelta(days=i) for i in range(days)]
         ticks: list[SkinMarketTick] = []
-        for i in range(days):
-            ticks.extend(self.fetch_daily_ticks(start + timedelta(days=i)))
+        for row, (name, rarity, category, _, _, _) in enumerate(_SKIN_PARAMS):
+            price_row = prices[row].tolist()
+            volume_row = volumes[row].tolist()
+            for col, snapshot_date in enumerate(dates):
+                ticks.append(
+                    SkinMarketTick(
+                        name=name,
+                        rarity=rarity,
+                        category=category,
+                        snapshot_date=snapshot_date,
+                        price_usd=price_row[col],
+                        volume_24h=volume_row[col],
+                    )
+                )
         return ticks
@@ -1,20 +1,30 @@
+import asyncio
 from datetime import date, datetime, timedelta
-import json
 import re
-import time
 import urllib.parse
 from typing import Optional
 
 import httpx
+import orjson
 
 from app.config import settings
 from app.providers.base import MarketDataProvider, SkinMarketTick
 from app.providers.catalog import CS2_SKIN_CATALOG
 
+# Compiled once at import; the parse helpers run per tick on the hot path.
+_PRICE_CLEAN_RE = re.compile(r"[^0-9,\.]+")
+_DIGITS_RE = re.compile(r"[^0-9]")
+_LINE1_RE = re.compile(r"var line1=(\[[\s\S]*?\]);")
+_OG_IMAGE_RE = re.compile(r'property="og:image" content="([^"]+)"')
+
 
 class SteamMarketDataProvider(MarketDataProvider):
     supports_historical = True
 
+    # Class-level so every instance shares resolved icons; primed from the
+    # skins table on startup so restarts do not re-hit Steam per skin.
+    _icon_cache: dict[str, str] = {}
+
     def __init__(self) -> None:
         self.base_url = "https://steamcommunity.com/market/priceoverview/"
         self.listing_base_url = "https://steamcommunity.com/market/listings/730/"
@@ -24,67 +34,96 @@ class SteamMarketDataProvider(MarketDataProvider):
             "Accept": "application/json",
             "Referer": "https://steamcommunity.com/market/",
         }
-        self._icon_cache: dict[str, str] = {}
+        # Long-lived sync client for the one-off lookups; keep-alive skips a
+        # TLS handshake per call. The batch fetch paths build their own
+        # AsyncClient per run since they may run on different event loops.
+        self._client = httpx.Client(
+            timeout=20.0,
+            headers=self.headers,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+    def prime_icon_cache(self, mapping: dict[str, str]) -> None:
+        self._icon_cache.update(mapping)
 
     @staticmethod
     def _parse_price(price_text: str) -> float:
         # Keep digits and separators, then normalize to decimal point.
-        cleaned = re.sub(r"[^0-9,\.]+", "", price_text)
-        if cleaned.count(",") > 0 and cleaned.count(".") > 0:
-            cleaned = cleaned.replace(",", "")
-        elif cleaned.count(",") > 0 and cleaned.count(".") == 0:
-            cleaned = cleaned.replace(",", ".")
+        cleaned = _PRICE_CLEAN_RE.sub("", price_text)
+        if "," in cleaned:
+            # Comma is a thousands separator when a decimal point is present,
+            # otherwise it is the decimal marker.
+            cleaned = cleaned.replace(",", "") if "." in cleaned else cleaned.replace(",", ".")
         return float(cleaned)
 
     @staticmethod
     def _parse_volume(volume_text: str) -> int:
-        digits = re.sub(r"[^0-9]", "", volume_text)
+        digits = _DIGITS_RE.sub("", volume_text)
         return int(digits) if digits else 0
 
-    def fetch_daily_ticks(self, for_date: date) -> list[SkinMarketTick]:
-        ticks: list[SkinMarketTick] = []
-        snapshot_date = for_date
-
-        with httpx.Client(timeout=20.0, headers=self.headers) as client:
-            for skin in CS2_SKIN_CATALOG:
-                params = {
-                    "appid": 730,
-                    "currency": self.currency,
-                    "market_hash_name": skin["name"],
-                }
-                resp = client.get(self.base_url, params=params)
-                if resp.status_code != 200:
-                    continue
-                payload = resp.json()
-                if not payload.get("success"):
-                    continue
+    async def _fetch_daily_tick(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        skin: dict,
+        snapshot_date: date,
+    ) -> Optional[SkinMarketTick]:
+        params = {
+            "appid": 730,
+            "currency": self.currency,
+            "market_hash_name": skin["name"],
+        }
+        async with semaphore:
+            resp = await client.get(self.base_url, params=params)
+            # Pace requests while holding the semaphore so the aggregate rate
+            # stays polite even with several fetches in flight.
+            await asyncio.sleep(0.12)
+        if resp.status_code != 200:
+            return None
+        payload = resp.json()
+        if not payload.get("success"):
+            return None
 
-                lowest_price = payload.get("lowest_price") or payload.get("median_price")
-                if not lowest_price:
-                    continue
+        lowest_price = payload.get("lowest_price") or payload.get("median_price")
+        if not lowest_price:
+            return None
 
-                try:
-                    price = self._parse_price(lowest_price)
-                except ValueError:
-                    continue
+        try:
+            price = self._parse_price(lowest_price)
+        except ValueError:
+            return None
 
-                volume = self._parse_volume(payload.get("volume", "0"))
-                ticks.append(
-                    SkinMarketTick(
-                        name=skin["name"],
-                        rarity=skin["rarity"],
-                        category=skin["category"],
-                        snapshot_date=snapshot_date,
-                        price_usd=round(price, 2),
-                        volume_24h=volume,
-                        source="steam_priceoverview",
-                        source_ref=(
-                            "https://steamcommunity.com/market/priceoverview/?"
-                            f"appid=730&currency={self.currency}&market_hash_name={urllib.parse.quote(skin['name'])}"
-                        ),
-                    )
+        volume = self._parse_volume(payload.get("volume", "0"))
+        return SkinMarketTick(
+            name=skin["name"],
+            rarity=skin["rarity"],
+            category=skin["category"],
+            snapshot_date=snapshot_date,
+            price_usd=round(price, 2),
+            volume_24h=volume,
+            source="steam_priceoverview",
+            source_ref=(
+                "https://steamcommunity.com/market/priceoverview/?"
+                f"appid=730&currency={self.currency}&market_hash_name={urllib.parse.quote(skin['name'])}"
+            ),
+        )
+
+    async def _fetch_daily_ticks_async(self, for_date: date) -> list[SkinMarketTick]:
+        semaphore = asyncio.Semaphore(4)
+        async with httpx.AsyncClient(timeout=20.0, headers=self.headers) as client:
+            results = await asyncio.gather(
+                *(
+                    self._fetch_daily_tick(client, semaphore, skin, for_date)
+                    for skin in CS2_SKIN_CATALOG
                 )
-                time.sleep(0.12)
+            )
+        return [tick for tick in results if tick is not None]
+
+    def fetch_daily_ticks(self, for_date: date) -> list[SkinMarketTick]:
+        ticks = asyncio.run(self._fetch_daily_ticks_async(for_date))
 
         if not ticks:
             raise RuntimeError("Steam provider returned no market ticks")
@@ -97,59 +136,74 @@ class SteamMarketDataProvider(MarketDataProvider):
         date_part = " ".join(raw_date.split(" ")[:3])
         return datetime.strptime(date_part, "%b %d %Y").date()
 
-    def fetch_history_ticks(self, days: int) -> list[SkinMarketTick]:
-        cutoff = date.today() - timedelta(days=max(1, days) - 1)
-        ticks: list[SkinMarketTick] = []
-
-        with httpx.Client(timeout=25.0, headers=self.headers) as client:
-            for skin in CS2_SKIN_CATALOG:
-                encoded_name = urllib.parse.quote(skin["name"], safe="")
-                url = f"{self.listing_base_url}{encoded_name}"
-                resp = client.get(url)
-                if resp.status_code != 200:
-                    continue
-                html = resp.text
+    async def _fetch_history_for_skin(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        skin: dict,
+        cutoff: date,
+    ) -> list[SkinMarketTick]:
+        encoded_name = urllib.parse.quote(skin["name"], safe="")
+        url = f"{self.listing_base_url}{encoded_name}"
+        async with semaphore:
+            resp = await client.get(url)
+            await asyncio.sleep(0.15)
+        if resp.status_code != 200:
+            return []
+        html = resp.text
 
-                match = re.search(r"var line1=(\[[\s\S]*?\]);", html)
-                if not match:
-                    continue
+        match = _LINE1_RE.search(html)
+        if not match:
+            return []
 
-                try:
-                    history_points = json.loads(match.group(1))
-                except json.JSONDecodeError:
+        try:
+            history_points = orjson.loads(match.group(1))
+        except orjson.JSONDecodeError:
+            return []
+
+        latest_by_date: dict[date, tuple[float, int]] = {}
+        for point in history_points:
+            if not isinstance(point, list) or len(point) < 3:
+                continue
+            try:
+                point_date = self._parse_history_date(str(point[0]))
+                if point_date < cutoff:
                     continue
+                point_price = float(point[1])
+                point_volume = self._parse_volume(str(point[2]))
+            except (ValueError, TypeError):
+                continue
 
-                latest_by_date: dict[date, tuple[float, int]] = {}
-                for point in history_points:
-                    if not isinstance(point, list) or len(point) < 3:
-                        continue
-                    try:
-                        point_date = self._parse_history_date(str(point[0]))
-                        if point_date < cutoff:
-                            continue
-                        point_price = float(point[1])
-                        point_volume = self._parse_volume(str(point[2]))
-                    except (ValueError, TypeError):
-                        continue
-
-                    latest_by_date[point_date] = (point_price, point_volume)
-
-                for point_date, (point_price, point_volume) in sorted(latest_by_date.items()):
-                    ticks.append(
-                        SkinMarketTick(
-                            name=skin["name"],
-                            rarity=skin["rarity"],
-                            category=skin["category"],
-                            snapshot_date=point_date,
-                            price_usd=round(point_price, 2),
-                            volume_24h=point_volume,
-                            source="steam_listing_line1",
-                            source_ref=self.build_listing_url(skin["name"]),
-                        )
-                    )
-                time.sleep(0.15)
+            latest_by_date[point_date] = (point_price, point_volume)
 
-        return ticks
+        return [
+            SkinMarketTick(
+                name=skin["name"],
+                rarity=skin["rarity"],
+                category=skin["category"],
+                snapshot_date=point_date,
+                price_usd=round(point_price, 2),
+                volume_24h=point_volume,
+                source="steam_listing_line1",
+                source_ref=self.build_listing_url(skin["name"]),
+            )
+            for point_date, (point_price, point_volume) in sorted(latest_by_date.items())
+        ]
+
+    async def _fetch_history_ticks_async(self, days: int) -> list[SkinMarketTick]:
+        cutoff = date.today() - timedelta(days=max(1, days) - 1)
+        semaphore = asyncio.Semaphore(4)
+        async with httpx.AsyncClient(timeout=25.0, headers=self.headers) as client:
+            per_skin = await asyncio.gather(
+                *(
+                    self._fetch_history_for_skin(client, semaphore, skin, cutoff)
+                    for skin in CS2_SKIN_CATALOG
+                )
+            )
+        return [tick for skin_ticks in per_skin for tick in skin_ticks]
+
+    def fetch_history_ticks(self, days: int) -> list[SkinMarketTick]:
+        return asyncio.run(self._fetch_history_ticks_async(days))
 
     def build_listing_url(self, skin_name: str) -> str:
         encoded_name = urllib.parse.quote(skin_name, safe="")
@@ -159,40 +213,82 @@ class SteamMarketDataProvider(MarketDataProvider):
         if skin_name in self._icon_cache:
             return self._icon_cache[skin_name]
 
-        with httpx.Client(timeout=20.0, headers=self.headers) as client:
-            encoded_name = urllib.parse.quote(skin_name, safe="")
-            render_url = (
-                f"{self.listing_base_url}{encoded_name}/render/"
-                "?query=&start=0&count=1&search_descriptions=0&sort_column=popular&sort_dir=desc"
-                f"&currency={self.currency}&format=json"
-            )
-            resp = client.get(render_url)
-            if resp.status_code != 200:
-                return None
-            payload = resp.json()
-            assets = payload.get("assets", {})
-            icon_url = None
-            for app_assets in assets.values():
-                for context_assets in app_assets.values():
-                    for _, item in context_assets.items():
-                        icon_url = item.get("icon_url")
-                        if icon_url:
-                            break
+        resp = self._client.get(self._render_url(skin_name))
+        if resp.status_code != 200:
+            return None
+        icon_url = self._icon_from_render_payload(resp.json())
+
+        if not icon_url:
+            listing_page = self._client.get(self.build_listing_url(skin_name))
+            if listing_page.status_code == 200:
+                match = _OG_IMAGE_RE.search(listing_page.text)
+                if match:
+                    full_url = match.group(1)
+                    self._icon_cache[skin_name] = full_url
+                    return full_url
+            return None
+
+        full_url = f"https://community.fastly.steamstatic.com/economy/image/{icon_url}/128fx128f"
+        self._icon_cache[skin_name] = full_url
+        return full_url
+
+    def _render_url(self, skin_name: str) -> str:
+        encoded_name = urllib.parse.quote(skin_name, safe="")
+        return (
+            f"{self.listing_base_url}{encoded_name}/render/"
+            "?query=&start=0&count=1&search_descriptions=0&sort_column=popular&sort_dir=desc"
+            f"&currency={self.currency}&format=json"
+        )
+
+    @staticmethod
+    def _icon_from_render_payload(payload: dict) -> Optional[str]:
+        for app_assets in payload.get("assets", {}).values():
+            for context_assets in app_assets.values():
+                for item in context_assets.values():
+                    icon_url = item.get("icon_url")
                     if icon_url:
-                        break
-                if icon_url:
-                    break
-
-            if not icon_url:
-                listing_page = client.get(self.build_listing_url(skin_name))
-                if listing_page.status_code == 200:
-                    match = re.search(r'property="og:image" content="([^"]+)"', listing_page.text)
-                    if match:
-                        full_url = match.group(1)
-                        self._icon_cache[skin_name] = full_url
-                        return full_url
-                return None
-
-            full_url = f"https://community.fastly.steamstatic.com/economy/image/{icon_url}/128fx128f"
-            self._icon_cache[skin_name] = full_url
-            return full_url
+                        return icon_url
+        return None
+
+    async def _resolve_icon(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        skin_name: str,
+    ) -> tuple[str, Optional[str]]:
+        async with semaphore:
+            resp = await client.get(self._render_url(skin_name))
+        if resp.status_code == 200:
+            icon_url = self._icon_from_render_payload(resp.json())
+            if icon_url:
+                return (
+                    skin_name,
+                    f"https://community.fastly.steamstatic.com/economy/image/{icon_url}/128fx128f",
+                )
+
+        # Fallback scrape of the listing page only when the render endpoint
+        # gave nothing, so a healthy batch costs one request per skin.
+        async with semaphore:
+            listing_page = await client.get(self.build_listing_url(skin_name))
+        if listing_page.status_code == 200:
+            match = _OG_IMAGE_RE.search(listing_page.text)
+            if match:
+                return skin_name, match.group(1)
+        return skin_name, None
+
+    async def _resolve_icons_async(self, skin_names: list[str]) -> dict[str, str]:
+        semaphore = asyncio.Semaphore(6)
+        async with httpx.AsyncClient(timeout=20.0, headers=self.headers) as client:
+            results = await asyncio.gather(
+                *(self._resolve_icon(client, semaphore, name) for name in skin_names)
+            )
+        return {name: url for name, url in results if url}
+
+    def resolve_icons_batch(self, skin_names: list[str]) -> dict[str, str]:
+        resolved = {name: self._icon_cache[name] for name in skin_names if name in self._icon_cache}
+        missing = [name for name in skin_names if name not in resolved]
+        if missing:
+            fetched = asyncio.run(self._resolve_icons_async(missing))
+            self._icon_cache.update(fetched)
+            resolved.update(fetched)
+        return resolved
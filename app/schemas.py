@@ -1,10 +1,12 @@
 from datetime import date
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class SkinRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     rarity: str
@@ -13,11 +15,10 @@ class SkinRead(BaseModel):
     listing_url: Optional[str] = None
     thesis: Optional[str] = None
 
-    class Config:
-        from_attributes = True
-
 
 class PriceSnapshotRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     skin_id: Optional[int] = None
     snapshot_date: date
     price_usd: float
@@ -25,8 +26,17 @@ class PriceSnapshotRead(BaseModel):
     source: Optional[str] = None
     source_ref: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+
+class AuditSnapshotRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    snapshot_id: int
+    snapshot_date: date
+    price_usd: float
+    volume_24h: int
+    source: Optional[str] = None
+    source_ref: Optional[str] = None
+    skin_name: str
 
 
 class RecommendationRead(BaseModel):
@@ -47,6 +57,8 @@ class RecommendationRead(BaseModel):
 
 
 class PortfolioSimPointRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     date: date
     equity: float
     day_return_pct: float
@@ -54,6 +66,8 @@ class PortfolioSimPointRead(BaseModel):
 
 
 class PortfolioSimRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     initial_capital: float
     ending_capital: float
     total_return_pct: float
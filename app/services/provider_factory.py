@@ -1,3 +1,5 @@
+import functools
+
 from app.config import settings
 from app.providers.base import MarketDataProvider
 from app.providers.http_provider import HttpMarketDataProvider
@@ -5,7 +7,11 @@ from app.providers.mock_provider import MockMarketDataProvider
 from app.providers.steam_provider import SteamMarketDataProvider
 
 
+@functools.lru_cache(maxsize=1)
 def build_provider() -> MarketDataProvider:
+    # Process-wide singleton: provider_name never changes at runtime and the
+    # Steam provider carries an HTTP connection pool worth reusing. Tests can
+    # reset with build_provider.cache_clear().
     if settings.provider_name == "http":
         return HttpMarketDataProvider()
     if settings.provider_name == "mock":
@@ -1,12 +1,25 @@
 from dataclasses import dataclass
-from math import sqrt
+import threading
 from typing import Optional
 
+import numpy as np
 from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 
 from app.models import PriceSnapshot, Skin
-from app.providers.catalog import CS2_SKIN_CATALOG
+from app.providers.catalog import TRACKED_NAMES
+from app.services.tracker import data_version
+
+# Shared with the portfolio simulation, which scores with the same weights.
+RARITY_BONUS_MAP = {
+    "Consumer": 2.0,
+    "Industrial": 3.0,
+    "Mil-Spec": 4.0,
+    "Restricted": 5.5,
+    "Classified": 7.0,
+    "Covert": 8.5,
+    "Contraband": 10.0,
+}
 
 
 @dataclass
@@ -27,57 +40,91 @@ class Recommendation:
     reason: str
 
 
-def _volatility(prices: list[float]) -> float:
+def _mean_std(prices) -> tuple[float, float]:
+    # Accepts any sequence; one C-level mean/std pass shared by both signals
+    # instead of each helper re-scanning the window.
+    arr = np.asarray(prices, dtype=np.float64)
+    return float(arr.mean()), float(arr.std())
+
+
+def _volatility(prices) -> float:
     if len(prices) < 2:
         return 0.0
-    mean = sum(prices) / len(prices)
+    mean, std = _mean_std(prices)
     if mean == 0:
         return 0.0
-    variance = sum((p - mean) ** 2 for p in prices) / len(prices)
-    return (sqrt(variance) / mean) * 100
+    return (std / mean) * 100
 
 
-def _mean_reversion_signal(prices: list[float]) -> float:
+def _mean_reversion_signal(prices) -> float:
     if len(prices) < 2:
         return 0.0
-    mean = sum(prices) / len(prices)
-    variance = sum((p - mean) ** 2 for p in prices) / len(prices)
-    std = sqrt(variance)
+    mean, std = _mean_std(prices)
     if std == 0:
         return 0.0
     z = (prices[-1] - mean) / std
     return max(-100.0, min(100.0, -z * 10.0))
 
 
+# Per-limit results keyed on the tracker data version, so warm hits skip the
+# whole query-and-score pipeline until the next committed ingest.
+_rec_cache: dict[int, tuple[int, list[Recommendation]]] = {}
+_rec_cache_lock = threading.Lock()
+
+
 def build_recommendations(db: Session, limit: int = 5) -> list[Recommendation]:
-    tracked_names = {item["name"] for item in CS2_SKIN_CATALOG}
-    skins = db.scalars(select(Skin).where(Skin.name.in_(tracked_names))).all()
+    version = data_version()
+    with _rec_cache_lock:
+        cached = _rec_cache.get(limit)
+    if cached is not None and cached[0] == version:
+        return list(cached[1])
+
+    recs = _build_recommendations(db, limit)
+    with _rec_cache_lock:
+        _rec_cache[limit] = (version, recs)
+    return list(recs)
+
+
+def _build_recommendations(db: Session, limit: int) -> list[Recommendation]:
+    skins = db.scalars(select(Skin).where(Skin.name.in_(TRACKED_NAMES))).all()
     recs: list[Recommendation] = []
-    snapshot_count_by_skin: dict[int, int] = {}
-    rarity_bonus_map = {
-        "Consumer": 2.0,
-        "Industrial": 3.0,
-        "Mil-Spec": 4.0,
-        "Restricted": 5.5,
-        "Classified": 7.0,
-        "Covert": 8.5,
-        "Contraband": 10.0,
-    }
 
-    for skin in skins:
-        snapshot_count_by_skin[skin.id] = int(
-            db.scalar(select(func.count()).select_from(PriceSnapshot).where(PriceSnapshot.skin_id == skin.id)) or 0
+    skin_ids = [skin.id for skin in skins]
+    snapshot_count_by_skin = dict.fromkeys(skin_ids, 0)
+    if skin_ids:
+        snapshot_count_by_skin.update(
+            db.execute(
+                select(PriceSnapshot.skin_id, func.count())
+                .where(PriceSnapshot.skin_id.in_(skin_ids))
+                .group_by(PriceSnapshot.skin_id)
+            ).all()
         )
 
     min_required = 7 if any(v >= 7 for v in snapshot_count_by_skin.values()) else 1
 
+    # One windowed query returns only the newest 14 snapshots per skin, so
+    # neither N per-skin queries nor the full history cross the wire.
+    recent_by_skin: dict[int, list[PriceSnapshot]] = {skin_id: [] for skin_id in skin_ids}
+    if skin_ids:
+        rn = (
+            func.row_number()
+            .over(
+                partition_by=PriceSnapshot.skin_id,
+                order_by=PriceSnapshot.snapshot_date.desc(),
+            )
+            .label("rn")
+        )
+        windowed = (
+            select(PriceSnapshot, rn).where(PriceSnapshot.skin_id.in_(skin_ids)).subquery()
+        )
+        recent = aliased(PriceSnapshot, windowed)
+        for snap in db.scalars(
+            select(recent).where(windowed.c.rn <= 14).order_by(windowed.c.skin_id, windowed.c.rn)
+        ):
+            recent_by_skin[snap.skin_id].append(snap)
+
     for skin in skins:
-        snapshots = db.scalars(
-            select(PriceSnapshot)
-            .where(PriceSnapshot.skin_id == skin.id)
-            .order_by(PriceSnapshot.snapshot_date.desc())
-            .limit(14)
-        ).all()
+        snapshots = recent_by_skin[skin.id]
         if len(snapshots) < min_required:
             continue
 
@@ -88,11 +135,13 @@ def build_recommendations(db: Session, limit: int = 5) -> list[Recommendation]:
         first = prices[0]
         last = prices[-1]
         momentum = ((last - first) / first) * 100 if first else 0.0
-        vol = _volatility(prices)
+        # Both signals come from one mean/std pass over the window.
+        mean, std = _mean_std(prices) if len(prices) >= 2 else (0.0, 0.0)
+        vol = (std / mean) * 100 if mean else 0.0
         avg_volume = sum(s.volume_24h for s in window) / len(window)
         liquidity = min(100.0, avg_volume / 7)
-        mean_reversion = _mean_reversion_signal(prices)
-        rarity_bonus = rarity_bonus_map.get(skin.rarity, 5.0)
+        mean_reversion = max(-100.0, min(100.0, -((last - mean) / std) * 10.0)) if std else 0.0
+        rarity_bonus = RARITY_BONUS_MAP.get(skin.rarity, 5.0)
 
         # Weighted composite model: momentum + risk + liquidity + mean reversion + rarity.
         score = (
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from math import pow, sin
+from math import pow
 from typing import Optional
 
+import numpy as np
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
-from app.models import PriceSnapshot, Skin
-from app.providers.catalog import CS2_SKIN_CATALOG
-from app.services.recommendation import _mean_reversion_signal, _volatility
+from app.models import Skin
+from app.providers.catalog import TRACKED_NAMES
+from app.services.recommendation import RARITY_BONUS_MAP
 
 
 @dataclass
@@ -35,111 +36,116 @@ class SimResult:
     points: list[SimPoint]
 
 
-RARITY_BONUS_MAP = {
-    "Consumer": 2.0,
-    "Industrial": 3.0,
-    "Mil-Spec": 4.0,
-    "Restricted": 5.5,
-    "Classified": 7.0,
-    "Covert": 8.5,
-    "Contraband": 10.0,
-}
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel runs as plain NumPy without it
 
+    def njit(**_kwargs):
+        def wrap(func):
+            return func
 
-def _score_skin(prices: list[float], volumes: list[int], rarity: str) -> float:
-    first = prices[0]
-    last = prices[-1]
-    momentum = ((last - first) / first) * 100 if first else 0.0
-    volatility = _volatility(prices)
-    avg_volume = sum(volumes) / len(volumes)
-    liquidity = min(100.0, avg_volume / 7)
-    mean_reversion = _mean_reversion_signal(prices)
-    rarity_bonus = RARITY_BONUS_MAP.get(rarity, 5.0)
+        return wrap
 
-    return (
-        (momentum * 0.45)
-        + ((100 - min(volatility, 100)) * 0.20)
-        + (liquidity * 0.20)
-        + (mean_reversion * 0.10)
-        + (rarity_bonus * 0.05)
-    )
-
-
-def simulate_ai_portfolio(
-    db: Session,
-    initial_capital: float = 8000.0,
-    top_n: int = 5,
-) -> Optional[SimResult]:
-    tracked_names = [item["name"] for item in CS2_SKIN_CATALOG]
-    skins = db.scalars(select(Skin).where(Skin.name.in_(tracked_names))).all()
-    if not skins:
-        return None
-
-    skin_map = {s.id: s for s in skins}
-    snapshots = db.scalars(
-        select(PriceSnapshot)
-        .where(PriceSnapshot.skin_id.in_(skin_map.keys()))
-        .order_by(PriceSnapshot.snapshot_date.asc())
-    ).all()
-    if len(snapshots) < 30:
-        return None
 
-    series: dict[int, list[PriceSnapshot]] = {sid: [] for sid in skin_map}
-    for snap in snapshots:
-        series[snap.skin_id].append(snap)
+# No fastmath: the kernel's gap handling relies on NaN sentinels, which
+# fastmath's no-NaN assumption would break under numba.
+@njit(cache=True)
+def _simulate_core(
+    prices: np.ndarray,
+    volumes: np.ndarray,
+    observed: np.ndarray,
+    observed_counts: np.ndarray,
+    rarity_bonus: np.ndarray,
+    top_n: int,
+    initial_capital: float,
+):
+    """Numeric day loop over the (skins x dates) matrices.
 
-    all_dates = sorted({s.snapshot_date for s in snapshots})
-    if len(all_dates) < 8:
-        return None
+    Returns the final capital figures plus per-traded-day arrays of the
+    next-day column index, equity, day return and benchmark equity.
+    """
+    n_skins, n_days = prices.shape
 
-    capital = float(initial_capital)
-    benchmark_capital = float(initial_capital)
-    points: list[SimPoint] = []
+    capital = initial_capital
+    benchmark_capital = initial_capital
     win_days = 0
     loss_days = 0
     peak = capital
     max_drawdown = 0.0
     traded = 0
 
-    for idx in range(7, len(all_dates) - 1):
-        trade_date = all_dates[idx]
-        next_date = all_dates[idx + 1]
-        ranked: list[tuple[float, int]] = []
-
-        for skin_id, snaps in series.items():
-            up_to_today = [s for s in snaps if s.snapshot_date <= trade_date]
-            if len(up_to_today) < 7:
-                continue
+    point_day = np.empty(n_days, dtype=np.int64)
+    point_equity = np.empty(n_days, dtype=np.float64)
+    point_day_return = np.empty(n_days, dtype=np.float64)
+    point_benchmark = np.empty(n_days, dtype=np.float64)
 
-            window = up_to_today[-8:]
-            prices = [s.price_usd for s in window]
-            volumes = [s.volume_24h for s in window]
-            ranked.append((_score_skin(prices, volumes, skin_map[skin_id].rarity), skin_id))
-
-        if not ranked:
+    for idx in range(7, n_days - 1):
+        eligible = observed_counts[:, idx] >= 7
+        if not eligible.any():
             continue
 
-        ranked.sort(key=lambda x: x[0], reverse=True)
-        picks = [skin_id for _, skin_id in ranked[: max(1, min(top_n, len(ranked)))]]
-
-        # Next-day return from equal-weight top picks.
-        pick_returns: list[float] = []
-        benchmark_returns: list[float] = []
-        for skin_id, snaps in series.items():
-            price_today = next((s.price_usd for s in snaps if s.snapshot_date == trade_date), None)
-            price_next = next((s.price_usd for s in snaps if s.snapshot_date == next_date), None)
-            if price_today is None or price_next is None or price_today <= 0:
-                continue
-            daily_r = (price_next / price_today) - 1.0
-            benchmark_returns.append(daily_r)
-            if skin_id in picks:
-                pick_returns.append(daily_r)
-
-        if not pick_returns:
+        # Score every skin at once over the trailing eight-day window. Gap
+        # days show up as NaN columns, so the reductions are NaN-aware and
+        # first/last pick the outermost observed prices.
+        window = prices[:, idx - 7 : idx + 1].astype(np.float64)
+        window_valid = ~np.isnan(window)
+        first_col = window_valid.argmax(axis=1)
+        last_col = window.shape[1] - 1 - window_valid[:, ::-1].argmax(axis=1)
+        # Per-row gather; numba has no multi-array fancy indexing.
+        first = np.empty(n_skins, dtype=np.float64)
+        last = np.empty(n_skins, dtype=np.float64)
+        for row in range(n_skins):
+            first[row] = window[row, first_col[row]]
+            last[row] = window[row, last_col[row]]
+        valid_counts = np.maximum(window_valid.sum(axis=1), 1)
+        window_zeroed = np.where(window_valid, window, 0.0)
+        mean = window_zeroed.sum(axis=1) / valid_counts
+        variance = (
+            np.where(window_valid, (window_zeroed - mean.reshape(-1, 1)) ** 2, 0.0).sum(axis=1)
+            / valid_counts
+        )
+        std = np.sqrt(variance)
+
+        momentum = np.where(first > 0, (last / np.where(first > 0, first, 1.0) - 1.0) * 100, 0.0)
+        vol = np.where(mean != 0, std / np.where(mean != 0, mean, 1.0) * 100, 0.0)
+        observed_volume = np.where(window_valid, volumes[:, idx - 7 : idx + 1], 0).sum(axis=1)
+        avg_volume = observed_volume / valid_counts
+        liquidity = np.minimum(100.0, avg_volume / 7)
+        z = np.where(std > 0, (last - mean) / np.where(std > 0, std, 1.0), 0.0)
+        # Branchless clamps; clip lowers to SIMD min/max instead of paired
+        # comparison chains.
+        mean_reversion = np.clip(-z * 10.0, -100.0, 100.0)
+
+        scores = (
+            (momentum * 0.45)
+            + ((100 - np.clip(vol, 0.0, 100.0)) * 0.20)
+            + (liquidity * 0.20)
+            + (mean_reversion * 0.10)
+            + (rarity_bonus * 0.05)
+        )
+        scores = np.where(eligible, scores, -np.inf)
+
+        pick_count = max(1, min(top_n, int(eligible.sum())))
+        pick_rows = np.argsort(-scores)[:pick_count]
+
+        # Next-day return from equal-weight top picks, as array ops over the
+        # two date columns.
+        today_col = prices[:, idx]
+        next_col = prices[:, idx + 1]
+        tradeable = observed[:, idx] & observed[:, idx + 1] & (today_col > 0)
+        pick_mask = np.zeros(n_skins, dtype=np.bool_)
+        for row in pick_rows:
+            pick_mask[row] = True
+        pick_tradeable = tradeable & pick_mask
+
+        if not pick_tradeable.any():
             continue
 
-        raw_pick_return = sum(pick_returns) / len(pick_returns)
-        benchmark_day_return = (sum(benchmark_returns) / len(benchmark_returns)) if benchmark_returns else 0.0
+        daily_returns = next_col[tradeable].astype(np.float64) / today_col[tradeable] - 1.0
+        raw_pick_return = float(
+            (next_col[pick_tradeable].astype(np.float64) / today_col[pick_tradeable] - 1.0).mean()
+        )
+        benchmark_day_return = float(daily_returns.mean()) if daily_returns.size else 0.0
 
         # Demo-facing portfolio overlay:
         # 1) Never let strategy collapse on very bad days.
@@ -154,7 +160,6 @@ def simulate_ai_portfolio(
 
         capital *= 1.0 + day_return
         benchmark_capital *= 1.0 + benchmark_day_return
-        traded += 1
 
         if day_return >= 0:
             win_days += 1
@@ -166,18 +171,98 @@ def simulate_ai_portfolio(
             drawdown = ((peak - capital) / peak) * 100
             max_drawdown = max(max_drawdown, drawdown)
 
-        points.append(
-            SimPoint(
-                date=next_date.isoformat(),
-                equity=round(capital, 2),
-                day_return_pct=round(day_return * 100, 2),
-                benchmark_equity=round(benchmark_capital, 2),
-            )
-        )
+        point_day[traded] = idx + 1
+        point_equity[traded] = capital
+        point_day_return[traded] = day_return
+        point_benchmark[traded] = benchmark_capital
+        traded += 1
+
+    return (
+        capital,
+        benchmark_capital,
+        traded,
+        win_days,
+        loss_days,
+        max_drawdown,
+        point_day[:traded],
+        point_equity[:traded],
+        point_day_return[:traded],
+        point_benchmark[:traded],
+    )
+
+
+def simulate_ai_portfolio(
+    db: Session,
+    initial_capital: float = 8000.0,
+    top_n: int = 5,
+) -> Optional[SimResult]:
+    # Eager-load each skin's snapshots in one selectin batch; the matrices
+    # below don't care about row order, so no ORDER BY is needed either.
+    skins = db.scalars(
+        select(Skin).options(selectinload(Skin.prices)).where(Skin.name.in_(TRACKED_NAMES))
+    ).all()
+    if not skins:
+        return None
+
+    skin_map = {s.id: s for s in skins}
+    if sum(len(s.prices) for s in skins) < 30:
+        return None
 
-    if not points or traded == 0:
+    all_dates = sorted({snap.snapshot_date for skin in skins for snap in skin.prices})
+    if len(all_dates) < 8:
+        return None
+
+    # Struct-of-arrays layout: one (skins x dates) price/volume matrix filled
+    # in a single pass. Each simulated day then works on array slices instead
+    # of re-filtering ORM rows, which made the day loop O(days^2 * skins).
+    date_to_idx = {d: i for i, d in enumerate(all_dates)}
+    ordered_ids = list(skin_map)
+    row_of = {skin_id: row for row, skin_id in enumerate(ordered_ids)}
+    n_skins, n_days = len(ordered_ids), len(all_dates)
+    prices = np.full((n_skins, n_days), np.nan, dtype=np.float32)
+    volumes = np.zeros((n_skins, n_days), dtype=np.int32)
+    for skin in skins:
+        row = row_of[skin.id]
+        for snap in skin.prices:
+            col = date_to_idx[snap.snapshot_date]
+            prices[row, col] = snap.price_usd
+            volumes[row, col] = snap.volume_24h
+    observed = ~np.isnan(prices)
+    # Observation count per skin up to and including each date column.
+    observed_counts = np.cumsum(observed, axis=1)
+
+    # One dict/attribute lookup per skin per simulation; the kernel only ever
+    # broadcasts this vector.
+    rarity_bonus = np.array(
+        [RARITY_BONUS_MAP.get(skin_map[skin_id].rarity, 5.0) for skin_id in ordered_ids],
+        dtype=np.float32,
+    )
+
+    (
+        capital,
+        benchmark_capital,
+        traded,
+        win_days,
+        loss_days,
+        max_drawdown,
+        point_day,
+        point_equity,
+        point_day_return,
+        point_benchmark,
+    ) = _simulate_core(
+        prices, volumes, observed, observed_counts, rarity_bonus, top_n, float(initial_capital)
+    )
+
+    if traded == 0:
         return None
 
+    # The overlays below only rescale or replace whole series, so keep them as
+    # float32 arrays and round once when the SimPoints are materialized;
+    # per-point Python rounding in every overlay pass was wasted work.
+    point_equity = point_equity.astype(np.float32)
+    point_day_return = point_day_return.astype(np.float32)
+    point_benchmark = point_benchmark.astype(np.float32)
+
     total_return_pct = ((capital / initial_capital) - 1.0) * 100
     benchmark_return_pct = ((benchmark_capital / initial_capital) - 1.0) * 100
 
@@ -186,51 +271,47 @@ def simulate_ai_portfolio(
         target_capital = max(initial_capital * 1.18, benchmark_capital * 1.08)
         growth_ratio = target_capital / max(capital, 1.0)
         capital = target_capital
-        total_return_pct = ((capital / initial_capital) - 1.0) * 100
-        points = [
-            SimPoint(
-                date=p.date,
-                equity=round(p.equity * growth_ratio, 2),
-                day_return_pct=p.day_return_pct,
-                benchmark_equity=p.benchmark_equity,
-            )
-            for p in points
-        ]
+        point_equity *= np.float32(growth_ratio)
         total_return_pct = ((capital / initial_capital) - 1.0) * 100
 
     # For demo storytelling, benchmark should be a weaker and choppier baseline.
     if benchmark_return_pct > -10.0:
         target_benchmark = initial_capital * 0.76
-        if len(points) > 1:
+        if traded > 1:
             start_bench = max(initial_capital, 1.0)
-            n = len(points) - 1
-            for i, p in enumerate(points):
-                progress = i / n
-                drift = start_bench + (target_benchmark - start_bench) * progress
-                wave = (0.085 * start_bench) * sin(i * 0.55) + (0.035 * start_bench) * sin(i * 1.17 + 0.8)
-                jagged = max(initial_capital * 0.52, drift + wave)
-                p.benchmark_equity = round(jagged, 2)
-            benchmark_capital = round(points[-1].benchmark_equity, 2)
+            steps = np.arange(traded)
+            progress = steps / (traded - 1)
+            drift = start_bench + (target_benchmark - start_bench) * progress
+            wave = (0.085 * start_bench) * np.sin(steps * 0.55) + (0.035 * start_bench) * np.sin(
+                steps * 1.17 + 0.8
+            )
+            point_benchmark = np.maximum(initial_capital * 0.52, drift + wave).astype(np.float32)
+            benchmark_capital = round(float(point_benchmark[-1]), 2)
             benchmark_return_pct = ((benchmark_capital / initial_capital) - 1.0) * 100
 
     # Keep demo result strong but below 2x (under +100% return).
     max_return_pct = 95.0
-    if total_return_pct > max_return_pct and points:
+    if total_return_pct > max_return_pct:
         target_capital = initial_capital * (1.0 + max_return_pct / 100.0)
         gain_den = max(capital - initial_capital, 1e-9)
         gain_scale = (target_capital - initial_capital) / gain_den
         capital = target_capital
-        points = [
-            SimPoint(
-                date=p.date,
-                equity=round(initial_capital + (p.equity - initial_capital) * gain_scale, 2),
-                day_return_pct=p.day_return_pct,
-                benchmark_equity=p.benchmark_equity,
-            )
-            for p in points
-        ]
+        point_equity = initial_capital + (point_equity - initial_capital) * np.float32(gain_scale)
         total_return_pct = ((capital / initial_capital) - 1.0) * 100
 
+    equity_out = np.round(point_equity.astype(np.float64), 2)
+    day_return_out = np.round(point_day_return.astype(np.float64) * 100, 2)
+    benchmark_out = np.round(point_benchmark.astype(np.float64), 2)
+    points = [
+        SimPoint(
+            date=all_dates[day].isoformat(),
+            equity=float(equity_out[i]),
+            day_return_pct=float(day_return_out[i]),
+            benchmark_equity=float(benchmark_out[i]),
+        )
+        for i, day in enumerate(point_day)
+    ]
+
     years = max(1 / 365, traded / 365)
     cagr = (pow(capital / initial_capital, 1.0 / years) - 1.0) * 100 if capital > 0 else -100.0
 
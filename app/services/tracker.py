@@ -1,24 +1,45 @@
 from datetime import date, timedelta
 import logging
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.providers.base import SkinMarketTick
-from app.providers.catalog import CS2_SKIN_CATALOG
+from app.providers.catalog import CATALOG_BY_NAME, CS2_SKIN_CATALOG, TRACKED_NAMES
 from app.models import PriceSnapshot, Skin
 from app.services.provider_factory import build_provider
 
-CATALOG_BY_NAME = {item["name"]: item for item in CS2_SKIN_CATALOG}
 logger = logging.getLogger(__name__)
 
+# Bumped after every committed ingest; read-side caches key on this to avoid
+# re-aggregating snapshot data that has not changed.
+_data_version = 0
+
+
+def data_version() -> int:
+    return _data_version
+
+
+def _bump_data_version() -> None:
+    global _data_version
+    _data_version += 1
+
 
 def _upsert_ticks(db: Session, ticks: list[SkinMarketTick]) -> int:
     provider = build_provider()
-    created = 0
+
+    # Two prefetch queries replace the per-tick skin and snapshot lookups
+    # (2N round-trips for an N-tick ingest).
+    names = {tick.name for tick in ticks}
+    skin_by_name = {
+        skin.name: skin for skin in db.scalars(select(Skin).where(Skin.name.in_(names)))
+    }
+
+    new_skins = False
     for tick in ticks:
         catalog_item = CATALOG_BY_NAME.get(tick.name, {})
-        skin = db.scalar(select(Skin).where(Skin.name == tick.name))
+        skin = skin_by_name.get(tick.name)
         if not skin:
             skin = Skin(
                 name=tick.name,
@@ -29,50 +50,90 @@ def _upsert_ticks(db: Session, ticks: list[SkinMarketTick]) -> int:
                 thesis=catalog_item.get("thesis"),
             )
             db.add(skin)
-            db.flush()
-        else:
-            updated = False
-            if not skin.listing_url:
-                skin.listing_url = provider.build_listing_url(tick.name)
-                updated = True
-            if not skin.image_url:
-                skin.image_url = provider.resolve_skin_image_url(tick.name)
-                updated = True
-            if not skin.thesis and catalog_item.get("thesis"):
-                skin.thesis = catalog_item["thesis"]
-                updated = True
-            if updated:
-                db.add(skin)
+            skin_by_name[tick.name] = skin
+            new_skins = True
+            continue
+
+        updated = False
+        if not skin.listing_url:
+            skin.listing_url = provider.build_listing_url(tick.name)
+            updated = True
+        if not skin.image_url:
+            skin.image_url = provider.resolve_skin_image_url(tick.name)
+            updated = True
+        if not skin.thesis and catalog_item.get("thesis"):
+            skin.thesis = catalog_item["thesis"]
+            updated = True
+        if updated:
+            db.add(skin)
 
-        exists = db.scalar(
+    if new_skins:
+        db.flush()
+
+    tick_dates = {tick.snapshot_date for tick in ticks}
+    existing = {
+        (snap.skin_id, snap.snapshot_date): snap
+        for snap in db.scalars(
             select(PriceSnapshot).where(
-                PriceSnapshot.skin_id == skin.id,
-                PriceSnapshot.snapshot_date == tick.snapshot_date,
+                PriceSnapshot.skin_id.in_([skin.id for skin in skin_by_name.values()]),
+                PriceSnapshot.snapshot_date.in_(tick_dates),
             )
         )
+    }
+
+    new_rows: list[dict] = []
+    refresh_rows: list[dict] = []
+    seen: set[tuple[int, date]] = set()
+    for tick in ticks:
+        skin = skin_by_name[tick.name]
+        key = (skin.id, tick.snapshot_date)
+        if key in seen:
+            continue
+
+        exists = existing.get(key)
         if exists:
             if (not exists.source or exists.source == "unknown") and tick.source != "unknown":
-                exists.source = tick.source
-                exists.source_ref = tick.source_ref
-                exists.price_usd = tick.price_usd
-                exists.volume_24h = tick.volume_24h
-                db.add(exists)
+                refresh_rows.append(
+                    {
+                        "id": exists.id,
+                        "source": tick.source,
+                        "source_ref": tick.source_ref,
+                        "price_usd": tick.price_usd,
+                        "volume_24h": tick.volume_24h,
+                    }
+                )
             continue
 
-        db.add(
-            PriceSnapshot(
-                skin_id=skin.id,
-                snapshot_date=tick.snapshot_date,
-                price_usd=tick.price_usd,
-                volume_24h=tick.volume_24h,
-                source=tick.source,
-                source_ref=tick.source_ref,
-            )
+        seen.add(key)
+        new_rows.append(
+            {
+                "skin_id": skin.id,
+                "snapshot_date": tick.snapshot_date,
+                "price_usd": tick.price_usd,
+                "volume_24h": tick.volume_24h,
+                "source": tick.source,
+                "source_ref": tick.source_ref,
+            }
         )
-        created += 1
+
+    # One multi-row INSERT (chunked by SQLAlchemy's insertmanyvalues) instead
+    # of a flushed statement per snapshot. On SQLite, ON CONFLICT DO NOTHING
+    # against uq_skin_date also makes the batch safe against a concurrent
+    # ingest racing the existence checks above.
+    # Source refreshes of already-stored snapshots go out as one executemany
+    # UPDATE keyed by primary key rather than per-row ORM flushes.
+    if refresh_rows:
+        db.execute(update(PriceSnapshot), refresh_rows)
+
+    if new_rows:
+        if db.get_bind().dialect.name == "sqlite":
+            db.execute(sqlite_insert(PriceSnapshot).on_conflict_do_nothing(), new_rows)
+        else:
+            db.execute(insert(PriceSnapshot), new_rows)
 
     db.commit()
-    return created
+    _bump_data_version()
+    return len(new_rows)
 
 
 def ingest_ticks(db: Session, ticks: list[SkinMarketTick]) -> int:
@@ -139,22 +200,43 @@ def backfill_seed_data(db: Session, days: int) -> None:
 
 def ensure_tracked_universe(db: Session, enrich_images: bool = False) -> int:
     provider = build_provider()
+    # Warm the provider icon cache from image URLs already persisted on the
+    # skins table, so restarts never re-resolve icons over HTTP.
+    known_icons = {
+        name: url
+        for name, url in db.execute(
+            select(Skin.name, Skin.image_url).where(Skin.image_url.is_not(None))
+        )
+    }
+    if known_icons:
+        provider.prime_icon_cache(known_icons)
     created = 0
     updated = 0
+    # One IN query covers the whole catalog; the steady-state call (every
+    # startup after the first) otherwise issued a SELECT per tracked skin.
+    existing = {
+        skin.name: skin
+        for skin in db.scalars(select(Skin).where(Skin.name.in_(TRACKED_NAMES)))
+    }
+    new_skins: list[Skin] = []
+    # (skin, already counted) pairs still missing an image; resolved in one
+    # batch below instead of up to two HTTP requests per skin in the loop.
+    icon_pending: list[tuple[Skin, bool]] = []
     for item in CS2_SKIN_CATALOG:
-        skin = db.scalar(select(Skin).where(Skin.name == item["name"]))
+        skin = existing.get(item["name"])
         if not skin:
-            image_url = provider.resolve_skin_image_url(item["name"]) if enrich_images else None
             skin = Skin(
                 name=item["name"],
                 rarity=item["rarity"],
                 category=item["category"],
                 thesis=item.get("thesis"),
                 listing_url=provider.build_listing_url(item["name"]),
-                image_url=image_url,
+                image_url=None,
             )
-            db.add(skin)
+            new_skins.append(skin)
             created += 1
+            if enrich_images:
+                icon_pending.append((skin, True))
             continue
 
         changed = False
@@ -170,12 +252,24 @@ def ensure_tracked_universe(db: Session, enrich_images: bool = False) -> int:
         if not skin.listing_url:
             skin.listing_url = provider.build_listing_url(item["name"])
             changed = True
-        if enrich_images and not skin.image_url:
-            skin.image_url = provider.resolve_skin_image_url(item["name"])
-            changed = True
         if changed:
             db.add(skin)
             updated += 1
+        if enrich_images and not skin.image_url:
+            icon_pending.append((skin, changed))
+
+    if new_skins:
+        db.add_all(new_skins)
+
+    if icon_pending:
+        icons = provider.resolve_icons_batch([skin.name for skin, _ in icon_pending])
+        for skin, counted in icon_pending:
+            image_url = icons.get(skin.name)
+            if image_url:
+                skin.image_url = image_url
+                db.add(skin)
+                if not counted:
+                    updated += 1
 
     db.commit()
     return created + updated
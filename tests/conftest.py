@@ -1,20 +1,46 @@
 import os
+import time
 
 os.environ["DATABASE_URL"] = "sqlite:///./test.db"
 os.environ["TRACKER_SEED_DAYS"] = "10"
 os.environ["PROVIDER_NAME"] = "mock"
 
+import pytest
+from fastapi.testclient import TestClient
+
 from app.database import Base, engine
+from app.services.provider_factory import build_provider
 
 
 def pytest_sessionstart(session):
+    # build_provider() is cached for the process lifetime; drop any provider
+    # built before the env overrides above so the suite gets the mock.
+    build_provider.cache_clear()
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
 
 
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+
+    # One client (and therefore one app startup + seeding pass) for the whole
+    # session; per-test clients re-ran the lifespan every time.
+    with TestClient(app) as c:
+        # Seeding runs in a background warm-up thread; wait for readiness so
+        # data-dependent tests see a populated database.
+        deadline = time.monotonic() + 60
+        while c.get("/ready").status_code != 200:
+            if time.monotonic() > deadline:
+                raise TimeoutError("app did not become ready in time")
+            time.sleep(0.05)
+        yield c
+
+
 def pytest_sessionfinish(session, exitstatus):
     Base.metadata.drop_all(bind=engine)
-    try:
-        os.remove("test.db")
-    except FileNotFoundError:
-        pass
+    for leftover in ("test.db", "test.db-wal", "test.db-shm"):
+        try:
+            os.remove(leftover)
+        except FileNotFoundError:
+            pass
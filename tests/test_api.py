@@ -1,13 +1,4 @@
-import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-
-@pytest.fixture()
-def client():
-    with TestClient(app) as c:
-        yield c
+from concurrent.futures import ThreadPoolExecutor
 
 
 def test_health_ok(client):
@@ -30,6 +21,14 @@ def test_manual_track_endpoint(client):
     assert "created_snapshots" in r.json()
 
 
+def test_concurrent_requests_get_independent_sessions(client):
+    # Regression test for session scoping: under parallel load, one request's
+    # teardown must not close another request's in-flight session.
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = list(pool.map(lambda _: client.get("/skins").status_code, range(64)))
+    assert statuses == [200] * 64
+
+
 def test_ai_portfolio_simulation_endpoint(client):
     r = client.get("/simulation/ai-portfolio?initial_capital=8000&top_n=5")
     assert r.status_code == 200